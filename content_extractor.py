@@ -1,5 +1,8 @@
-from typing import Dict, Any
-from html_parser import HTMLParser
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+from html_parser import HTMLParser, parse_html
 from utils import setup_logging
 
 logger = setup_logging()
@@ -9,11 +12,99 @@ class ContentExtractor:
 
     def __init__(self, timeout: int = 10, user_agent: str | None = None):
         self.parser = HTMLParser(timeout=timeout, user_agent=user_agent)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
 
-    def extract(self, url: str) -> Dict[str, Any]:
+    def __enter__(self) -> "ContentExtractor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "ContentExtractor":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.parser.close_async()
+        self.close()
+
+    def close(self) -> None:
+        self.parser.close()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def extract(self, url: str, mode: str = "full") -> Dict[str, Any]:
         page_info, html = self.parser.fetch_page(url)
-        parsed = self.parser.parse_html(html, page_info["url"])  # usa l'URL finale dopo redirect
+        parsed = self.parser.parse_html(html, page_info["url"], mode=mode)  # usa l'URL finale dopo redirect
+        return {
+            "page": page_info,
+            "content": parsed,
+        }
+
+    async def extract_many(self, urls: Sequence[str]) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Scarica gli URL in parallelo e analizza le pagine su un pool di processi.
+
+        I risultati seguono l'ordine di `urls`; per gli URL falliti viene restituita
+        l'eccezione al posto del dizionario.
+        """
+        import asyncio
+
+        try:
+            return await asyncio.gather(*(self._extract_async(url) for url in urls), return_exceptions=True)
+        finally:
+            # la sessione aiohttp vive quanto la chiamata: niente sessioni aperte su loop già chiusi
+            await self.parser.close_async()
+
+    def extract_batch(self, urls: Sequence[str]) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Versione sincrona di extract_many: scarica con la sessione HTTP condivisa e
+        affida l'analisi al pool di processi, così le pagine già scaricate vengono
+        analizzate mentre si recuperano le successive.
+
+        I risultati seguono l'ordine di `urls`; per gli URL falliti viene restituita
+        l'eccezione al posto del dizionario.
+        """
+        pool = self._get_process_pool()
+        pending: List[Union[Tuple[Dict[str, Any], Future], BaseException]] = []
+        for url in urls:
+            try:
+                page_info, html = self.parser.fetch_page(url)
+            except Exception as exc:
+                pending.append(exc)
+                continue
+            pending.append((page_info, pool.submit(parse_html, html, page_info["url"])))
+
+        results: List[Union[Dict[str, Any], BaseException]] = []
+        for item in pending:
+            if isinstance(item, BaseException):
+                results.append(item)
+                continue
+            page_info, future = item
+            try:
+                results.append({"page": page_info, "content": future.result()})
+            except Exception as exc:
+                logger.error(f"Errore durante l'analisi di {page_info['url']}: {exc}")
+                results.append(exc)
+        return results
+
+    async def _extract_async(self, url: str) -> Dict[str, Any]:
+        import asyncio
+
+        page_info, html = await self.parser.fetch_page_async(url)
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(self._get_process_pool(), parse_html, html, page_info["url"])
         return {
             "page": page_info,
             "content": parsed,
         }
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # spawn e non fork: il processo ha già thread attivi (listener dei log, resolver
+            # di asyncio) e un fork in quello stato può bloccare i processi figli
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
@@ -1,15 +1,48 @@
+import itertools
 import random
+import re
+import threading
 import time
 import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from lxml import etree
 from readability import Document
-from typing import Dict, Any, List, Optional, Sequence, Tuple, Union, Set
+from readability.htmls import build_doc, get_title, shorten_title
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from functools import lru_cache
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple, Union, Set
 from urllib.parse import urljoin, urlparse
 from utils import setup_logging, clean_text, format_size
 
 logger = setup_logging()
 
+# Documento completo o sotto-albero: entrambi espongono css()/css_first()
+DOMNode = Union[LexborHTMLParser, LexborNode]
+
+
+@lru_cache(maxsize=1024)
+def _resolve_url(base_url: str, href: str) -> str:
+    """urljoin memorizzato: nella stessa pagina gli stessi percorsi relativi si ripetono spesso."""
+    return urljoin(base_url, href)
+
+
+@lru_cache(maxsize=1024)
+def _netloc(url: str) -> str:
+    """Dominio (netloc) dell'URL, memorizzato per non rianalizzare sempre lo stesso indirizzo."""
+    return urlparse(url).netloc
+
+
+class _ReadabilityDocument(Document):
+    """Document che conserva l'albero lxml dell'articolo oltre all'HTML serializzato."""
+
+    summary_root = None
+
+    def get_clean_html(self):
+        self.summary_root = self.html
+        return super().get_clean_html()
+
 
 class HTMLParser:
     """Classe per analizzare e recuperare contenuti HTML"""
@@ -27,6 +60,27 @@ class HTMLParser:
         'article', 'story', 'content', 'body', 'post', 'entry', 'main',
         'text', 'read', 'news', 'detail'
     )
+    # Alternanze compilate una sola volta: una ricerca per elemento invece di una per parola chiave
+    _NOISE_RE = re.compile('|'.join(map(re.escape, NOISE_KEYWORDS)))
+    _ARTICLE_RE = re.compile('|'.join(map(re.escape, ARTICLE_HINTS)))
+    SCHEMA_SELECTORS: Sequence[str] = (
+        '[itemprop="articleBody"]',
+        '[itemtype*="Article"]',
+        'article',
+        '[role="main"]',
+        '.article-body',
+        '.story__content',
+        '.article__content'
+    )
+    SUBTITLE_CLASS_SELECTOR = 'h2[class*="subtitle" i], p[class*="subtitle" i]'
+    SUBTITLE_SELECTOR = '[data-testid*="subtitle"], .article-subtitle, .story__summary, .lead'
+    AUTHOR_SELECTOR = '[itemprop="author"], .author-name, .byline, [rel="author"]'
+    META_SELECTOR = 'meta[name][content], meta[property][content], meta[charset]'
+    GALLERY_LIMIT = 5
+    VIDEO_LIMIT = 3
+    # Soglie dei controlli economici che decidono se un contenitore merita il punteggio completo
+    BLOCK_MIN_DIRECT_TEXT = 100
+    BLOCK_MIN_DIRECT_PARAGRAPHS = 2
     REALISTIC_USER_AGENTS: Sequence[str] = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
@@ -34,6 +88,15 @@ class HTMLParser:
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_6) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
     )
+    DEFAULT_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+    DEFAULT_ACCEPT_LANGUAGE = "it-IT,it;q=0.9,en-US;q=0.8,en;q=0.7"
+    POOL_SIZE = 32
+    RETRY_STATUS_CODES: Sequence[int] = (502, 503, 504)
+    ASYNC_CONNECTION_LIMIT = 64
+    ASYNC_CONNECTION_LIMIT_PER_HOST = 8
+    DNS_CACHE_TTL = 300
+    PARSE_MODES: Sequence[str] = ('full', 'meta')
+    HEAD_CHUNK_SIZE = 16384
 
     def __init__(self, timeout=10, user_agent=None):
         """
@@ -44,9 +107,57 @@ class HTMLParser:
             user_agent: User-Agent personalizzato per le richieste HTTP
         """
         self.timeout = timeout
-        self.session = requests.Session()
+        self.session = self._build_session()
         self.user_agents: List[str] = self._normalize_user_agents(user_agent)
         self.session.headers.update({'User-Agent': self.user_agents[0]})
+        # Header già pronti per ogni user-agent: a ogni richiesta si passa il successivo senza toccare la sessione
+        self._header_variants: List[Dict[str, str]] = [
+            {'User-Agent': ua, 'Accept': self.DEFAULT_ACCEPT, 'Accept-Language': self.DEFAULT_ACCEPT_LANGUAGE}
+            for ua in self.user_agents
+        ]
+        self._header_cycle = itertools.cycle(self._header_variants)
+        self._next_request_at: Dict[str, float] = {}
+        self._throttle_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._async_session: Optional[Any] = None
+        self._async_session_loop: Optional[Any] = None
+
+    def __enter__(self) -> 'HTMLParser':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Chiude la sessione HTTP e le connessioni del pool."""
+        self._closed.set()
+        self.session.close()
+
+    async def close_async(self) -> None:
+        """Chiude la sessione aiohttp, se è stata creata."""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+            self._async_session_loop = None
+
+    def _build_session(self) -> requests.Session:
+        """Crea una sessione con pool di connessioni persistenti e retry sugli errori temporanei."""
+        session = requests.Session()
+        # Retry-After viene ignorato: un server potrebbe chiedere attese arbitrarie e superare il timeout
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            respect_retry_after_header=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'Connection': 'keep-alive',
+            'Accept-Encoding': DEFAULT_ACCEPT_ENCODING
+        })
+        return session
 
     def fetch_page(self, url: str) -> Tuple[Dict[str, Any], str]:
         """
@@ -61,10 +172,13 @@ class HTMLParser:
         logger.info(f"Recupero pagina: {url}")
 
         try:
-            self._wait_between_requests()
-            user_agent = self._choose_user_agent()
-            self.session.headers.update({'User-Agent': user_agent})
-            response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
+            self._wait_between_requests(url)
+            response = self.session.get(
+                url,
+                headers=self._next_headers(),
+                timeout=self.timeout,
+                allow_redirects=True
+            )
             response.raise_for_status()
 
             page_info = {
@@ -82,26 +196,106 @@ class HTMLParser:
             logger.error(f"Errore durante il recupero della pagina: {e}")
             raise e
 
-    def parse_html(self, html_content: str, url: str) -> Dict[str, Any]:
+    async def fetch_page_async(self, url: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Versione asincrona di fetch_page, pensata per scaricare molte pagine in parallelo
+
+        Args:
+            url: URL della pagina da recuperare
+
+        Returns:
+            Dizionario con informazioni sulla pagina e il suo contenuto
+        """
+        # import locali: il percorso sincrono non deve pagare il costo di asyncio/aiohttp
+        import asyncio
+        import aiohttp
+
+        logger.info(f"Recupero pagina: {url}")
+
+        try:
+            delay = self._reserve_request_slot(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            session = self._get_async_session()
+            async with session.get(url, headers=self._next_headers(), allow_redirects=True) as response:
+                response.raise_for_status()
+                content = await response.read()
+                encoding = response.get_encoding()
+
+            page_info = {
+                'url': str(response.url),
+                'status_code': response.status,
+                'encoding': encoding,
+                'size_bytes': len(content),
+                'size_readable': format_size(len(content)),
+                'headers': dict(response.headers)
+            }
+
+            return page_info, content.decode(encoding, errors='replace')
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Errore durante il recupero della pagina: {e}")
+            raise e
+
+    def _get_async_session(self) -> Any:
+        """Crea al primo uso la sessione aiohttp condivisa (DNS e connessioni riutilizzati)."""
+        import asyncio
+        import aiohttp
+
+        # la sessione è legata al loop che l'ha creata: con un nuovo asyncio.run() va ricreata
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_session_loop is not loop:
+            if self._async_session is not None and not self._async_session.closed:
+                # il loop precedente è già chiuso: la sessione non si può più chiudere con await
+                self._async_session.detach()
+            self._async_session_loop = loop
+            connector = aiohttp.TCPConnector(
+                limit=self.ASYNC_CONNECTION_LIMIT,
+                limit_per_host=self.ASYNC_CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_CACHE_TTL,
+                enable_cleanup_closed=True
+            )
+            self._async_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._async_session
+
+    def parse_html(self, html_content: str, url: str, mode: str = 'full') -> Dict[str, Any]:
         """
         Analizza il contenuto HTML e si concentra sull'articolo principale.
+
+        Con mode='meta' legge solo titolo e meta tag dell'<head>, senza costruire il DOM completo.
         """
+        if mode not in self.PARSE_MODES:
+            raise ValueError(f"Modalità di analisi non valida: {mode}")
         logger.info("Analisi HTML in corso...")
 
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
-            content_soup = self._prepare_content_soup(html_content)
+            if mode == 'meta':
+                head = self.extract_head_only(html_content)
+                return {
+                    'title': head['title'],
+                    'base_url': url,
+                    'domain': _netloc(url),
+                    'meta': head['meta']
+                }
+
+            tree = LexborHTMLParser(html_content)
+            title_node = tree.css_first('title')
 
             parsed_info = {
-                'title': clean_text(soup.title.string) if soup.title else "",
+                'title': clean_text(title_node.text()) if title_node else "",
                 'base_url': url,
-                'domain': urlparse(url).netloc,
-                'meta': self._extract_meta(soup)
+                'domain': _netloc(url),
+                'meta': self._extract_meta(tree)
             }
+            # Titolo e meta sono già letti: da qui in poi lo stesso albero viene ripulito sul posto
+            self._clean_tree(tree)
 
             readability_content = self._extract_main_content(html_content)
-            content_blocks = self._extract_content_blocks(content_soup)
-            schema_block = self._extract_schema_block(content_soup)
+            content_blocks = self._extract_content_blocks(tree)
+            schema_block = self._extract_schema_block(tree)
             if schema_block:
                 content_blocks.insert(0, schema_block)
 
@@ -110,13 +304,13 @@ class HTMLParser:
                 content_blocks,
                 parsed_info['title'],
                 parsed_info['meta'],
-                content_soup,
+                tree,
                 url
             )
 
             parsed_info.update({
                 'article': article_section,
-                'context': self._build_page_context(content_soup, url, article_section, content_blocks)
+                'context': self._build_page_context(tree, url, article_section, content_blocks)
             })
 
             return parsed_info
@@ -125,136 +319,187 @@ class HTMLParser:
             logger.error(f"Errore durante l'analisi HTML: {e}")
             raise e
 
-    def _extract_meta(self, soup: BeautifulSoup) -> Dict[str, str]:
+    def _extract_meta(self, tree: DOMNode) -> Dict[str, str]:
         """Estrae i meta tag dalla pagina"""
-        meta_tags = {}
-
-        for tag in soup.find_all('meta'):
-            if tag.get('name') and tag.get('content'):
-                meta_tags[tag['name']] = tag['content']
-            elif tag.get('property') and tag.get('content'):
-                meta_tags[tag['property']] = tag['content']
-            elif tag.get('charset'):
-                meta_tags['charset'] = tag['charset']
-
-        return meta_tags
-
-    def _extract_headings(self, soup: BeautifulSoup) -> Dict[str, List[str]]:
-        headings = {'h1': [], 'h2': [], 'h3': [], 'h4': [], 'h5': [], 'h6': []}
-        for level in range(1, 7):
-            for heading in soup.find_all(f'h{level}'):
-                headings[f'h{level}'].append(clean_text(heading.get_text()))
+        # Il selettore scarta in C i meta senza attributi utili; _meta_entry applica le priorità
+        nodes = tree.css(self.META_SELECTOR)
+        return dict(filter(None, (self._meta_entry(tag.attributes) for tag in nodes)))
+
+    def _meta_entry(self, attrs: Mapping[str, Optional[str]]) -> Optional[Tuple[str, str]]:
+        """Restituisce la coppia chiave/valore di un meta tag, se significativa."""
+        if attrs.get('name') and attrs.get('content'):
+            return attrs['name'], attrs['content']
+        if attrs.get('property') and attrs.get('content'):
+            return attrs['property'], attrs['content']
+        if attrs.get('charset'):
+            return 'charset', attrs['charset']
+        return None
+
+    def extract_head_only(self, html_content: Union[str, bytes], encoding: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Legge titolo e meta tag in streaming, fermandosi alla chiusura dell'<head>
+
+        Args:
+            html_content: HTML della pagina (str o bytes)
+            encoding: codifica dei bytes, di solito dall'header Content-Type (default utf-8);
+                ignorata se html_content è già una stringa
+
+        Returns:
+            Dizionario con 'title' e 'meta'
+        """
+        title: Optional[str] = None
+        meta_tags: Dict[str, str] = {}
+        if not html_content:
+            return {'title': "", 'meta': meta_tags}
+        if isinstance(html_content, bytes):
+            # senza codifica esplicita libxml2 ripiegherebbe su Latin-1 ("Caffè" -> "CaffÃ¨")
+            parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding or 'utf-8')
+        else:
+            parser = etree.HTMLPullParser(events=('start', 'end'))
+        size = self.HEAD_CHUNK_SIZE
+        for offset in [*range(0, len(html_content), size), None]:
+            if offset is None:
+                parser.close()
+            else:
+                parser.feed(html_content[offset:offset + size])
+            for event, element in parser.read_events():
+                tag = element.tag
+                if (event == 'start' and tag == 'body') or (event == 'end' and tag == 'head'):
+                    return {'title': title or "", 'meta': meta_tags}
+                if event != 'end':
+                    continue
+                if tag == 'meta':
+                    entry = self._meta_entry(element.attrib)
+                    if entry:
+                        meta_tags[entry[0]] = entry[1]
+                elif tag == 'title' and title is None:
+                    title = clean_text(''.join(element.itertext()))
+        return {'title': title or "", 'meta': meta_tags}
+
+    def _extract_headings(self, tree: DOMNode) -> Dict[str, List[str]]:
+        headings: Dict[str, List[str]] = {'h1': [], 'h2': [], 'h3': [], 'h4': [], 'h5': [], 'h6': []}
+        for heading in tree.css('h1, h2, h3, h4, h5, h6'):
+            headings[heading.tag].append(clean_text(heading.text(deep=True)))
         return headings
 
-    def _extract_links(self, soup: BeautifulSoup, base_url: str, limit: int = 100) -> List[Dict[str, str]]:
+    def _extract_links(self, tree: DOMNode, base_url: str, limit: int = 100) -> List[Dict[str, str]]:
         links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            absolute_url = urljoin(base_url, href)
+        base_netloc = _netloc(base_url)
+        for link in tree.css('a[href]'):
+            href = link.attributes.get('href') or ''
+            absolute_url = _resolve_url(base_url, href)
             links.append({
-                'text': clean_text(link.get_text()),
+                'text': clean_text(link.text(deep=True)),
                 'href': absolute_url,
-                'is_external': urlparse(base_url).netloc != urlparse(absolute_url).netloc,
-                'title': link.get('title', '')
+                'is_external': base_netloc != _netloc(absolute_url),
+                'title': link.attributes.get('title') or ''
             })
             if len(links) >= limit:
                 break
         return links
 
-    def _extract_images(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+    def _extract_images(self, tree: DOMNode, base_url: str) -> List[Dict[str, str]]:
         images = []
-        for img in soup.find_all('img'):
-            src = img.get('src') or img.get('data-src') or ''
+        for img in tree.css('img'):
+            attrs = img.attributes
+            src = attrs.get('src') or attrs.get('data-src') or ''
             if src:
-                absolute_url = urljoin(base_url, src)
+                absolute_url = _resolve_url(base_url, src)
                 images.append({
                     'src': absolute_url,
-                    'alt': img.get('alt', ''),
-                    'title': img.get('title', ''),
-                    'width': img.get('width', ''),
-                    'height': img.get('height', '')
+                    'alt': attrs.get('alt') or '',
+                    'title': attrs.get('title') or '',
+                    'width': attrs.get('width') or '',
+                    'height': attrs.get('height') or ''
                 })
         return images
 
-    def _extract_tables(self, html_fragment: Union[str, BeautifulSoup]) -> List[Dict[str, Any]]:
+    def _extract_tables(self, html_fragment: Union[str, DOMNode]) -> List[Dict[str, Any]]:
         tables: List[Dict[str, Any]] = []
         if not html_fragment:
             return tables
-        soup = html_fragment if isinstance(html_fragment, BeautifulSoup) else BeautifulSoup(html_fragment, 'lxml')
-        for i, table in enumerate(soup.find_all('table')):
+        tree = LexborHTMLParser(html_fragment) if isinstance(html_fragment, str) else html_fragment
+        for i, table in enumerate(tree.css('table')):
             table_data = {
                 'id': i,
                 'headers': [],
                 'rows': []
             }
-            headers = table.find_all('th')
+            headers = table.css('th')
             if headers:
-                table_data['headers'] = [clean_text(h.get_text()) for h in headers]
-            for row in table.find_all('tr'):
-                row_data = [clean_text(cell.get_text()) for cell in row.find_all(['td', 'th'])]
+                table_data['headers'] = [clean_text(h.text(deep=True)) for h in headers]
+            for row in table.css('tr'):
+                row_data = [clean_text(cell.text(deep=True)) for cell in row.css('td, th')]
                 if row_data:
                     table_data['rows'].append(row_data)
             tables.append(table_data)
         return tables
 
-    def _extract_lists(self, html_fragment: Union[str, BeautifulSoup]) -> Dict[str, List[List[str]]]:
+    def _extract_lists(self, html_fragment: Union[str, DOMNode]) -> Dict[str, List[List[str]]]:
         lists: Dict[str, List[List[str]]] = {'ul': [], 'ol': []}
         if not html_fragment:
             return lists
-        soup = html_fragment if isinstance(html_fragment, BeautifulSoup) else BeautifulSoup(html_fragment, 'lxml')
-        for ul in soup.find_all('ul'):
-            items = [clean_text(li.get_text()) for li in ul.find_all('li') if clean_text(li.get_text())]
-            if items:
-                lists['ul'].append(items)
-        for ol in soup.find_all('ol'):
-            items = [clean_text(li.get_text()) for li in ol.find_all('li') if clean_text(li.get_text())]
+        tree = LexborHTMLParser(html_fragment) if isinstance(html_fragment, str) else html_fragment
+        for list_node in tree.css('ul, ol'):
+            items = [item for item in (clean_text(li.text(deep=True)) for li in list_node.css('li')) if item]
             if items:
-                lists['ol'].append(items)
+                lists[list_node.tag].append(items)
         return lists
 
-    def _prepare_content_soup(self, html_content: str) -> BeautifulSoup:
-        """Crea una versione ripulita del DOM rimuovendo elementi rumorosi."""
-        soup = BeautifulSoup(html_content, 'lxml')
-        for element in soup(['script', 'style', 'noscript', 'iframe', 'svg', 'canvas']):
-            element.decompose()
-        for element in soup.find_all(True):
+    def _clean_tree(self, tree: LexborHTMLParser) -> None:
+        """Ripulisce il DOM sul posto rimuovendo elementi rumorosi (nessuna copia né nuovo parse)."""
+        tree.strip_tags(['script', 'style', 'noscript', 'iframe', 'svg', 'canvas'])
+        # Visita esplicita: un nodo rimosso porta con sé i discendenti, che non vanno più toccati
+        stack = [tree.root] if tree.root else []
+        while stack:
+            element = stack.pop()
             if self._should_skip_element(element):
                 element.decompose()
-        return soup
+                continue
+            stack.extend(reversed(list(element.iter())))
 
-    def _should_skip_element(self, element: Tag) -> bool:
-        if not isinstance(element, Tag):
+    def _should_skip_element(self, element: LexborNode) -> bool:
+        if not element or not element.is_element_node:
             return False
-        if element.name in {'nav', 'header', 'footer', 'aside'}:
+        if element.tag in {'nav', 'header', 'footer', 'aside'}:
             return True
-        attr_map = element.attrs or {}
+        attr_map = element.attributes
         role = (attr_map.get('role') or '').lower()
         if role in {'navigation', 'banner', 'complementary', 'contentinfo', 'search'}:
             return True
-        attributes: List[str] = []
+        # Le parole chiave non contengono spazi: cercarle token per token equivale a cercarle
+        # nella stringa unita, ma ogni token distinto viene classificato una sola volta
+        tokens: Set[str] = set()
         for attr in ('class', 'id', 'name', 'aria-label', 'data-track-label', 'data-component', 'data-testid'):
             value = attr_map.get(attr)
-            if isinstance(value, list):
-                attributes.extend([str(v).lower() for v in value if v])
-            elif value:
-                attributes.append(str(value).lower())
-        if attributes:
-            attrs = " ".join(attributes)
-            if any(keyword in attrs for keyword in self.NOISE_KEYWORDS):
-                if any(hint in attrs for hint in self.ARTICLE_HINTS):
-                    return False
-                return True
-        return False
+            if value:
+                tokens.update(value.lower().split())
+        has_noise = False
+        for token in tokens:
+            is_noise, is_hint = self._classify_token(token)
+            if is_hint:
+                return False
+            has_noise = has_noise or is_noise
+        return has_noise
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify_token(token: str) -> Tuple[bool, bool]:
+        """Indica se un token di attributo contiene una parola di rumore e/o un indizio di articolo."""
+        return bool(HTMLParser._NOISE_RE.search(token)), bool(HTMLParser._ARTICLE_RE.search(token))
 
     def _extract_main_content(self, html_content: str) -> Dict[str, Any]:
         try:
-            document = Document(html_content)
+            # Un solo parse lxml: readability lavora su copie dell'albero invece di rianalizzare la stringa
+            doc, _ = build_doc(html_content)
+            title = clean_text(get_title(doc)) or ""
+            short_title = clean_text(shorten_title(doc)) or ""
+            document = _ReadabilityDocument(doc)
             summary_html = document.summary()
-            summary_soup = BeautifulSoup(summary_html, 'lxml')
             paragraphs = [
-                clean_text(p.get_text())
-                for p in summary_soup.find_all(['p', 'li'])
-                if clean_text(p.get_text())
+                paragraph
+                for paragraph in (clean_text(''.join(p.itertext())) for p in document.summary_root.iter('p', 'li'))
+                if paragraph
             ]
             text = "\n\n".join(paragraphs).strip()
             if not text:
@@ -262,8 +507,8 @@ class HTMLParser:
             word_count = len(text.split())
             return {
                 'source': 'readability',
-                'title': clean_text(document.title()) or "",
-                'short_title': clean_text(document.short_title()) or "",
+                'title': title,
+                'short_title': short_title,
                 'summary_html': summary_html,
                 'text': text,
                 'paragraphs': paragraphs,
@@ -275,72 +520,186 @@ class HTMLParser:
             logger.debug(f"Readability non disponibile: {exc}")
             return {}
 
-    def _extract_content_blocks(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _extract_content_blocks(self, tree: DOMNode) -> List[Dict[str, Any]]:
         candidates: List[Dict[str, Any]] = []
-        for idx, element in enumerate(soup.find_all(['article', 'main', 'section', 'div'])):
-            if self._should_skip_element(element):
+        covered: Set[int] = set()
+        for idx, element in enumerate(tree.css('article, main, section, div')):
+            if not self._is_block_candidate(element) or self._should_skip_element(element):
+                continue
+            parent = element.parent
+            if parent is not None and parent.mem_id in covered and self._is_sole_wrapper(element, parent):
+                # Stesso contenuto del contenitore già valutato: inutile ripetere la visita
+                covered.add(element.mem_id)
                 continue
             block = self._build_block_info(element, idx)
             if block:
                 candidates.append(block)
+                covered.add(element.mem_id)
         candidates.sort(key=lambda item: item['score'], reverse=True)
         return candidates[:10]
 
-    def _build_block_info(self, element: Tag, idx: Union[int, str]) -> Optional[Dict[str, Any]]:
-        if not element or not isinstance(element, Tag):
+    def _is_block_candidate(self, element: LexborNode) -> bool:
+        """Filtro economico (solo attributi e figli diretti) prima della visita completa del blocco."""
+        if element.tag in ('article', 'main'):
+            return True
+        attrs = element.attributes
+        for value in (attrs.get('class'), attrs.get('id')):
+            if value and any(self._classify_token(token)[1] for token in value.lower().split()):
+                return True
+        direct_text = 0
+        direct_paragraphs = 0
+        for child in element.iter(include_text=True):
+            if child.tag == '-text':
+                direct_text += len((child.text_content or '').strip())
+            elif child.tag == 'p':
+                direct_paragraphs += 1
+        return direct_text >= self.BLOCK_MIN_DIRECT_TEXT or direct_paragraphs >= self.BLOCK_MIN_DIRECT_PARAGRAPHS
+
+    def _is_sole_wrapper(self, element: LexborNode, parent: LexborNode) -> bool:
+        """Vero se il genitore contiene solo questo elemento (niente testo né altri figli)."""
+        for child in parent.iter(include_text=True):
+            if child.tag == '-text':
+                if (child.text_content or '').strip():
+                    return False
+            elif child.is_element_node and child != element:
+                return False
+        return True
+
+    def _build_block_info(self, element: LexborNode, idx: Union[int, str]) -> Optional[Dict[str, Any]]:
+        if not element or not element.is_element_node:
             return None
-        text = clean_text(element.get_text(" ", strip=True))
-        word_count = len(text.split())
+        stats = self._scan_block(element)
+        word_count = stats['word_count']
         if word_count < 40:
             return None
-        link_text = " ".join(clean_text(a.get_text(" ", strip=True)) for a in element.find_all('a'))
-        link_density = len(link_text) / max(len(text), 1)
-        paragraphs = [
-            clean_text(p.get_text())
-            for p in element.find_all('p')
-            if clean_text(p.get_text())
-        ]
-        heading = element.find(['h1', 'h2', 'h3'])
-        heading_text = clean_text(heading.get_text()) if heading else ""
+        text = stats['text']
+        text_length = stats['text_length']
+        link_density = stats['link_length'] / max(text_length, 1)
+        paragraphs = stats['paragraphs']
+        heading_text = stats['heading']
         score = self._score_block(word_count, link_density, len(paragraphs), heading_text)
-        block_html = element.decode()
         return {
             'id': f'block_{idx}',
-            'tag': element.name,
-            'classes': element.get('class', []),
+            'tag': element.tag,
+            'classes': (element.attributes.get('class') or '').split(),
             'dom_path': self._compute_dom_path(element),
             'heading': heading_text,
             'paragraphs': paragraphs,
-            'html': block_html,
-            'text_preview': text[:280] + ('...' if len(text) > 280 else ''),
+            '_element': element,
+            'text_preview': text[:280] + ('...' if text_length > 280 else ''),
             'word_count': word_count,
             'link_density': round(link_density, 3),
             'score': round(score, 2)
         }
 
+    def _scan_block(self, element: LexborNode) -> Dict[str, Any]:
+        """
+        Visita il sotto-albero una sola volta raccogliendo i dati per il punteggio.
+
+        Per testo e link si tengono solo contatori di caratteri; le stringhe vengono
+        conservate solo per i paragrafi, il primo titolo e l'anteprima del testo.
+        """
+        preview: List[str] = []
+        preview_length = 0
+        word_count = 0
+        text_pieces = 0
+        text_length = 0
+        link_length = 0
+        link_count = 0
+        link_depth = 0
+        link_pieces = 0
+        link_chars = 0
+        paragraphs: List[str] = []
+        paragraph_parts: Optional[List[str]] = None
+        heading_parts: Optional[List[str]] = None
+        heading = ""
+        heading_seen = False
+        stack: List[Tuple[LexborNode, bool]] = [(element, False)]
+        while stack:
+            node, leaving = stack.pop()
+            tag = node.tag
+            if leaving:
+                if tag == 'a':
+                    link_depth -= 1
+                    if link_depth == 0:
+                        link_length += link_chars + max(link_pieces - 1, 0)
+                elif tag == 'p' and paragraph_parts is not None:
+                    paragraph = clean_text(''.join(paragraph_parts))
+                    if paragraph:
+                        paragraphs.append(paragraph)
+                    paragraph_parts = None
+                elif tag in ('h1', 'h2', 'h3') and heading_parts is not None:
+                    heading = clean_text(''.join(heading_parts))
+                    heading_parts = None
+                continue
+            if tag == '-text':
+                raw = node.text_content or ''
+                if paragraph_parts is not None:
+                    paragraph_parts.append(raw)
+                if heading_parts is not None:
+                    heading_parts.append(raw)
+                words = raw.split()
+                if not words:
+                    continue
+                piece = ' '.join(words)
+                word_count += len(words)
+                text_pieces += 1
+                text_length += len(piece)
+                if link_depth:
+                    link_pieces += 1
+                    link_chars += len(piece)
+                if preview_length <= 280:
+                    preview.append(piece)
+                    preview_length += len(piece) + 1
+                continue
+            if not node.is_element_node:
+                continue
+            if tag == 'a':
+                if link_depth == 0:
+                    link_count += 1
+                    link_pieces = 0
+                    link_chars = 0
+                link_depth += 1
+            elif tag == 'p' and paragraph_parts is None:
+                paragraph_parts = []
+            elif tag in ('h1', 'h2', 'h3') and not heading_seen:
+                heading_seen = True
+                heading_parts = []
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(list(node.iter(include_text=True))))
+        return {
+            'text': ' '.join(preview),
+            'text_length': text_length + max(text_pieces - 1, 0),
+            'word_count': word_count,
+            'link_length': link_length + max(link_count - 1, 0),
+            'paragraphs': paragraphs,
+            'heading': heading
+        }
+
     def _score_block(self, word_count: int, link_density: float, paragraph_count: int, heading: str) -> float:
         heading_bonus = 1.25 if heading else 1.0
         paragraph_bonus = 1 + min(paragraph_count, 5) * 0.1
         link_penalty = 1.0 - min(link_density, 0.9)
         return word_count * heading_bonus * paragraph_bonus * link_penalty
 
-    def _compute_dom_path(self, element: Tag) -> str:
+    def _compute_dom_path(self, element: LexborNode) -> str:
         parts: List[str] = []
-        current: Optional[Tag] = element
+        current: Optional[LexborNode] = element
         depth = 0
-        while current and isinstance(current, Tag) and depth < 5:
-            parent = current.parent if isinstance(current.parent, Tag) else None
+        while current and current.is_element_node and depth < 5:
+            parent = current.parent if current.parent and current.parent.is_element_node else None
             index = 0
             if parent:
-                siblings = [sib for sib in parent.find_all(current.name, recursive=False)]
-                for idx, sib in enumerate(siblings):
-                    if sib is current:
-                        index = idx
-                        break
-            identifier = current.get('id') or ""
-            class_attr = current.get('class') or []
-            cls = ".".join(class_attr[:2]) if isinstance(class_attr, list) else ""
-            descriptor = current.name
+                # Conta solo i fratelli precedenti con lo stesso tag: nessuna lista, O(posizione)
+                sibling = current.prev
+                while sibling is not None:
+                    if sibling.tag == current.tag:
+                        index += 1
+                    sibling = sibling.prev
+            identifier = current.attributes.get('id') or ""
+            class_attr = (current.attributes.get('class') or '').split()
+            cls = ".".join(class_attr[:2])
+            descriptor = current.tag
             if identifier:
                 descriptor += f"#{identifier}"
             elif cls:
@@ -363,6 +722,7 @@ class HTMLParser:
             return readability_content
         if blocks:
             best = blocks[0]
+            element = best.get('_element')
             text = "\n\n".join(best['paragraphs']).strip() or best['text_preview']
             word_count = best['word_count'] if best['word_count'] else len(text.split())
             return {
@@ -373,7 +733,9 @@ class HTMLParser:
                 'word_count': word_count,
                 'score': best['score'],
                 'dom_path': best['dom_path'],
-                'html': best.get('html'),
+                # Si serializza solo il blocco scelto, non tutti i candidati
+                'html': element.html if element is not None else best.get('html'),
+                '_element': element,
                 'reading_time_minutes': self._estimate_reading_time(word_count),
                 'confidence': min(0.85, 0.4 + min(best['score'] / 1500, 0.45))
             }
@@ -393,19 +755,20 @@ class HTMLParser:
         blocks: List[Dict[str, Any]],
         fallback_title: str,
         meta: Dict[str, Any],
-        content_soup: BeautifulSoup,
+        content_tree: LexborHTMLParser,
         base_url: str
     ) -> Dict[str, Any]:
         main_content = self._choose_main_content(readability_content, blocks, fallback_title)
-        metadata = self._extract_article_metadata(content_soup, meta)
-        media = self._extract_article_media(main_content, meta, base_url, content_soup)
+        fragment = self._main_fragment(main_content)
+        metadata = self._extract_article_metadata(content_tree, meta)
+        media = self._extract_article_media(fragment, meta, base_url, content_tree)
         excerpt_value: Optional[str] = metadata.get('excerpt')
         if not excerpt_value:
             paragraphs = main_content.get('paragraphs') or []
             excerpt_value = paragraphs[0] if paragraphs else ''
-        article_links = self._extract_links_from_main(main_content, base_url)
-        lists = self._extract_lists(main_content.get('summary_html') or main_content.get('html', ''))
-        tables = self._extract_tables(main_content.get('summary_html') or main_content.get('html', ''))
+        article_links = self._extract_links_from_main(fragment, base_url)
+        lists = self._extract_lists(fragment)
+        tables = self._extract_tables(fragment)
 
         body = {
             'text': main_content.get('text', '').strip(),
@@ -442,19 +805,25 @@ class HTMLParser:
         }
         return article
 
-    def _extract_links_from_main(self, main_content: Dict[str, Any], base_url: str) -> List[Dict[str, str]]:
+    def _main_fragment(self, main_content: Dict[str, Any]) -> Optional[DOMNode]:
+        """Restituisce il sotto-albero del contenuto principale, analizzando l'HTML solo se necessario."""
+        element = main_content.get('_element')
+        if element is not None:
+            return element
         html_fragment = main_content.get('summary_html') or main_content.get('html')
-        if not html_fragment:
+        return LexborHTMLParser(html_fragment) if html_fragment else None
+
+    def _extract_links_from_main(self, fragment: Optional[DOMNode], base_url: str) -> List[Dict[str, str]]:
+        if not fragment:
             return []
-        soup = BeautifulSoup(html_fragment, 'lxml')
-        return self._extract_links(soup, base_url, limit=40)
+        return self._extract_links(fragment, base_url, limit=40)
 
-    def _extract_article_metadata(self, soup: BeautifulSoup, meta: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_article_metadata(self, tree: DOMNode, meta: Dict[str, Any]) -> Dict[str, Any]:
         metadata: Dict[str, Any] = {}
         metadata['title'] = meta.get('og:title') or meta.get('twitter:title') or meta.get('title')
-        metadata['subtitle'] = self._find_subtitle(soup)
-        metadata['authors'] = self._find_authors(soup, meta)
-        published, updated = self._find_dates(soup, meta)
+        metadata['subtitle'] = self._find_subtitle(tree)
+        metadata['authors'] = self._find_authors(tree, meta)
+        published, updated = self._find_dates(tree, meta)
         metadata['published_at'] = published
         metadata['updated_at'] = updated
         metadata['section'] = meta.get('article:section') or meta.get('category-label')
@@ -463,14 +832,14 @@ class HTMLParser:
         metadata['tags'] = self._split_meta_values(meta.get('article:tag') or meta.get('parsely-tags'))
         return metadata
 
-    def _find_subtitle(self, soup: BeautifulSoup) -> Optional[str]:
-        subtitle = soup.find(['h2', 'p'], class_=lambda value: value and 'subtitle' in value.lower())
+    def _find_subtitle(self, tree: DOMNode) -> Optional[str]:
+        subtitle = tree.css_first(self.SUBTITLE_CLASS_SELECTOR)
         if subtitle:
-            return clean_text(subtitle.get_text())
-        possible = soup.select_one('[data-testid*="subtitle"], .article-subtitle, .story__summary, .lead')
-        return clean_text(possible.get_text()) if possible else None
+            return clean_text(subtitle.text(deep=True))
+        possible = tree.css_first(self.SUBTITLE_SELECTOR)
+        return clean_text(possible.text(deep=True)) if possible else None
 
-    def _find_authors(self, soup: BeautifulSoup, meta: Dict[str, Any]) -> List[str]:
+    def _find_authors(self, tree: DOMNode, meta: Dict[str, Any]) -> List[str]:
         authors: List[str] = []
         meta_candidates = [
             meta.get('author'),
@@ -482,24 +851,24 @@ class HTMLParser:
                 authors.extend([name.strip() for name in candidate.split(',') if name.strip()])
         if authors:
             return list(dict.fromkeys(authors))
-        dom_candidates = soup.select('[itemprop="author"], .author-name, .byline, [rel="author"]')
+        dom_candidates = tree.css(self.AUTHOR_SELECTOR)
         for element in dom_candidates:
-            text = clean_text(element.get_text())
+            text = clean_text(element.text(deep=True))
             if text and text.lower() not in ('di', 'by'):
                 authors.append(text)
         return list(dict.fromkeys(authors))
 
-    def _find_dates(self, soup: BeautifulSoup, meta: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    def _find_dates(self, tree: DOMNode, meta: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
         published = meta.get('article:published_time') or meta.get('pubdate') or meta.get('parsely-pub-date')
         updated = meta.get('article:modified_time') or meta.get('last-modified')
         if not published:
-            time_tag = soup.find('time', attrs={'datetime': True})
+            time_tag = tree.css_first('time[datetime]')
             if time_tag:
-                published = time_tag.get('datetime') or clean_text(time_tag.get_text())
+                published = time_tag.attributes.get('datetime') or clean_text(time_tag.text(deep=True))
         if not updated:
-            updated_tag = soup.find('time', attrs={'itemprop': 'dateModified'})
+            updated_tag = tree.css_first('time[itemprop="dateModified"]')
             if updated_tag:
-                updated = updated_tag.get('datetime') or clean_text(updated_tag.get_text())
+                updated = updated_tag.attributes.get('datetime') or clean_text(updated_tag.text(deep=True))
         return published, updated
 
     def _split_meta_values(self, value: Optional[str]) -> List[str]:
@@ -509,37 +878,41 @@ class HTMLParser:
 
     def _extract_article_media(
         self,
-        main_content: Dict[str, Any],
+        fragment: Optional[DOMNode],
         meta: Dict[str, Any],
         base_url: str,
-        soup: BeautifulSoup
+        tree: DOMNode
     ) -> Dict[str, Any]:
         media: Dict[str, Any] = {'hero_image': None, 'gallery': [], 'videos': []}
+        gallery: List[Dict[str, str]] = media['gallery']
+        videos: List[str] = media['videos']
         hero = meta.get('og:image') or meta.get('twitter:image') or meta.get('image_thumb_src')
         if hero:
-            media['hero_image'] = urljoin(base_url, hero)
-        fragment = main_content.get('summary_html') or main_content.get('html')
+            media['hero_image'] = _resolve_url(base_url, hero)
         if fragment:
-            fragment_soup = BeautifulSoup(fragment, 'lxml')
-            for img in fragment_soup.find_all('img'):
-                src = img.get('src') or img.get('data-src')
+            # Cicli limitati: si costruiscono solo gli elementi che finiscono nell'output
+            for img in fragment.css('img[src], img[data-src]'):
+                if len(gallery) >= self.GALLERY_LIMIT:
+                    break
+                attrs = img.attributes
+                src = attrs.get('src') or attrs.get('data-src')
                 if src:
-                    absolute = urljoin(base_url, src)
-                    media['gallery'].append({
-                        'src': absolute,
-                        'alt': clean_text(img.get('alt', '')),
-                        'title': clean_text(img.get('title', ''))
+                    gallery.append({
+                        'src': _resolve_url(base_url, src),
+                        'alt': clean_text(attrs.get('alt') or ''),
+                        'title': clean_text(attrs.get('title') or '')
                     })
-            for video in fragment_soup.find_all('video'):
-                source = video.find('source')
-                src = source.get('src') if source else video.get('src')
+            for video in fragment.css('video'):
+                if len(videos) >= self.VIDEO_LIMIT:
+                    break
+                source = video.css_first('source')
+                src = source.attributes.get('src') if source else video.attributes.get('src')
                 if src:
-                    media['videos'].append(urljoin(base_url, src))
-        iframe = soup.find('iframe', attrs={'src': True})
-        if iframe:
-            media['videos'].append(urljoin(base_url, iframe.get('src')))
-        media['gallery'] = media['gallery'][:5]
-        media['videos'] = media['videos'][:3]
+                    videos.append(_resolve_url(base_url, src))
+        if len(videos) < self.VIDEO_LIMIT:
+            iframe = tree.css_first('iframe[src]')
+            if iframe:
+                videos.append(_resolve_url(base_url, iframe.attributes.get('src')))
         return media
 
     def _estimate_reading_time(self, word_count: int) -> float:
@@ -547,18 +920,9 @@ class HTMLParser:
             return 0
         return round(max(word_count / 200, 0.1), 2)
 
-    def _extract_schema_block(self, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
-        selectors = [
-            '[itemprop="articleBody"]',
-            '[itemtype*="Article"]',
-            'article',
-            '[role="main"]',
-            '.article-body',
-            '.story__content',
-            '.article__content'
-        ]
-        for idx, selector in enumerate(selectors):
-            element = soup.select_one(selector)
+    def _extract_schema_block(self, tree: DOMNode) -> Optional[Dict[str, Any]]:
+        for idx, selector in enumerate(self.SCHEMA_SELECTORS):
+            element = tree.css_first(selector)
             if element and not self._should_skip_element(element):
                 block = self._build_block_info(element, f'schema_{idx}')
                 if block:
@@ -567,28 +931,28 @@ class HTMLParser:
 
     def _build_page_context(
         self,
-        soup: BeautifulSoup,
+        tree: DOMNode,
         base_url: str,
         article_section: Dict[str, Any],
         blocks: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         primary_links = article_section.get('links', [])
         context = {
-            'headings': self._extract_headings(soup),
-            'related_links': self._build_related_links(soup, base_url, primary_links),
+            'headings': self._extract_headings(tree),
+            'related_links': self._build_related_links(tree, base_url, primary_links),
             'candidates': self._summarize_blocks(blocks)
         }
         return context
 
     def _build_related_links(
         self,
-        soup: BeautifulSoup,
+        tree: DOMNode,
         base_url: str,
         primary_links: List[Dict[str, str]]
     ) -> List[Dict[str, str]]:
         seen: Set[str] = {link['href'] for link in primary_links}
         related: List[Dict[str, str]] = []
-        for link in self._extract_links(soup, base_url, limit=60):
+        for link in self._extract_links(tree, base_url, limit=60):
             if link['href'] in seen or not link['text']:
                 continue
             related.append(link)
@@ -620,13 +984,39 @@ class HTMLParser:
             ua_list = list(self.REALISTIC_USER_AGENTS)
         return ua_list
 
-    def _choose_user_agent(self) -> str:
-        """Restituisce un user-agent casuale per distribuire le richieste."""
-        if not self.user_agents:
-            self.user_agents = list(self.REALISTIC_USER_AGENTS)
-        return random.choice(self.user_agents)
+    def _next_headers(self) -> Dict[str, str]:
+        """Restituisce gli header della prossima richiesta, ruotando gli user-agent a turno."""
+        return next(self._header_cycle)
 
-    def _wait_between_requests(self) -> None:
-        """Inserisce un piccolo jitter tra le richieste per sembrare più umano."""
+    def _wait_between_requests(self, url: str) -> None:
+        """Inserisce un piccolo jitter tra le richieste allo stesso host per sembrare più umano."""
+        delay = self._reserve_request_slot(url)
+        # l'attesa si interrompe subito se il parser viene chiuso (es. Ctrl-C nella CLI)
+        if delay > 0 and self._closed.wait(delay):
+            raise requests.exceptions.ConnectionError(f"Parser chiuso prima di richiedere {url}")
+
+    def _reserve_request_slot(self, url: str) -> float:
+        """Prenota il prossimo turno libero per l'host e restituisce i secondi da attendere."""
+        host = _netloc(url)
         delay = random.uniform(0.15, 0.45)
-        time.sleep(delay)
+        with self._throttle_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at.get(host, now))
+            self._next_request_at[host] = start_at + delay
+        return start_at - now
+
+
+_process_parser: Optional[HTMLParser] = None
+
+
+def parse_html(html_content: str, url: str, mode: str = 'full') -> Dict[str, Any]:
+    """
+    Analizza una pagina con un HTMLParser condiviso dal processo.
+
+    Essendo una funzione di modulo è serializzabile con pickle e può essere
+    inviata a un ProcessPoolExecutor.
+    """
+    global _process_parser
+    if _process_parser is None:
+        _process_parser = HTMLParser()
+    return _process_parser.parse_html(html_content, url, mode=mode)
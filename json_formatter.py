@@ -1,19 +1,99 @@
+import gzip
 import json
+import mmap
+import os
 from typing import Any, Dict, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# sopra questa dimensione (byte) save_json scrive tramite mmap invece di os.write
+MMAP_THRESHOLD = 4 * 1024 * 1024
+# su Windows os.open apre in modalità testo e convertirebbe "\n" in "\r\n"
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def to_json_bytes(data: Dict[str, Any], pretty: bool = True) -> bytes:
+    """Converte un dizionario in JSON codificato UTF-8, usando orjson se disponibile."""
+    if orjson is not None:
+        return orjson.dumps(data, option=_orjson_option(pretty))
+    return _dumps_text(data, pretty).encode("utf-8")
+
 
 def to_json(data: Dict[str, Any], pretty: bool = True) -> str:
     """Converte un dizionario in stringa JSON."""
-    if pretty:
-        return json.dumps(data, ensure_ascii=False, indent=2)
-    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    if orjson is not None:
+        return orjson.dumps(data, option=_orjson_option(pretty)).decode("utf-8")
+    return _dumps_text(data, pretty)
 
 
 def save_json(data: Dict[str, Any], output_path: str, pretty: bool = True) -> str:
     """Salva i dati JSON su file e restituisce il percorso del file."""
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    json_str = to_json(data, pretty=pretty)
-    path.write_text(json_str, encoding="utf-8")
+    _write_bytes(path, to_json_bytes(data, pretty=pretty))
+    return str(path)
+
+
+def save_json_gz(data: Dict[str, Any], output_path: str, pretty: bool = False) -> str:
+    """Salva i dati JSON compressi con gzip (livello 1: veloce, ~5x più piccolo) e restituisce il percorso."""
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wb", compresslevel=1) as handle:
+        handle.write(to_json_bytes(data, pretty=pretty))
     return str(path)
+
+
+def _write_bytes(path: Path, payload: bytes) -> None:
+    """Scrive il buffer direttamente sul descrittore, senza passare dal livello io di Python."""
+    # senza posix_fallocate la mappatura resterebbe su un file sparso: niente mmap
+    if len(payload) >= MMAP_THRESHOLD and hasattr(os, "posix_fallocate"):
+        _write_bytes_mmap(path, payload)
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            # os.write può scrivere meno byte del richiesto su buffer molto grandi
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_bytes_mmap(path: Path, payload: bytes) -> None:
+    """Prealloca il file alla dimensione finale e copia il buffer in una mappatura in memoria."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+    try:
+        # riserva davvero i blocchi su disco: con disco o quota pieni fallisce qui con OSError,
+        # invece di un SIGBUS durante la scrittura nella mappatura
+        os.posix_fallocate(fd, 0, len(payload))
+        with mmap.mmap(fd, len(payload)) as mapped:
+            mapped[:] = payload
+    finally:
+        os.close(fd)
+
+
+def _orjson_option(pretty: bool) -> int:
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return option
+
+
+def _dumps_text(data: Dict[str, Any], pretty: bool) -> str:
+    """Serializzazione di riserva quando orjson non è installato: ujson, poi la libreria standard."""
+    if ujson is not None:
+        if pretty:
+            return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False, indent=2)
+        return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
@@ -1,28 +1,151 @@
-import argparse
-import re
+import functools
+import queue
+import string
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from types import SimpleNamespace
+from typing import List, NoReturn, Optional, Tuple
 from urllib.parse import urlparse
 
-from utils import is_valid_url, setup_logging
+from utils import is_valid_url, setup_logging, stop_logging
 from content_extractor import ContentExtractor
-from json_formatter import save_json, to_json
+from json_formatter import save_json, to_json_bytes
 
 logger = setup_logging()
 
+# numero massimo di URL scaricati in parallelo
+MAX_WORKERS = 16
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Web scraper semplice in JSON")
-    parser.add_argument("urls", nargs="+", help="Uno o più URL delle pagine da analizzare")
-    parser.add_argument("-o", "--output", help="Percorso file di output (solo se viene fornito un singolo URL)")
-    parser.add_argument("--output-dir", default="Results", help="Cartella dove salvare i risultati (default: Results)")
-    parser.add_argument("--no-pretty", action="store_true", help="Disabilita la formattazione leggibile del JSON")
-    parser.add_argument("--timeout", type=int, default=10, help="Timeout richieste HTTP (s)")
-    parser.add_argument("--user-agent", type=str, default=None, help="User-Agent personalizzato")
-    parser.add_argument("--stdout", action="store_true", help="Stampa il JSON su stdout oltre a salvarlo su file")
-    return parser.parse_args()
+
+class _SlugTable(dict):
+    """Tabella per str.translate: i caratteri ammessi restano, tutti gli altri diventano spazi."""
+
+    def __missing__(self, codepoint: int) -> str:
+        return " "
+
+
+_SLUG_TABLE = _SlugTable((ord(char), char) for char in string.ascii_letters + string.digits + "._-")
+
+
+_USAGE = (
+    "usage: scraper.py [-h] [-o OUTPUT] [--output-dir OUTPUT_DIR] [--no-pretty]\n"
+    "                  [--timeout TIMEOUT] [--user-agent USER_AGENT] [--stdout]\n"
+    "                  urls [urls ...]\n"
+)
+
+_HELP = _USAGE + """
+Web scraper semplice in JSON
+
+positional arguments:
+  urls                  Uno o più URL delle pagine da analizzare
+
+options:
+  -h, --help            show this help message and exit
+  -o OUTPUT, --output OUTPUT
+                        Percorso file di output (solo se viene fornito un
+                        singolo URL)
+  --output-dir OUTPUT_DIR
+                        Cartella dove salvare i risultati (default: Results)
+  --no-pretty           Disabilita la formattazione leggibile del JSON
+  --timeout TIMEOUT     Timeout richieste HTTP (s)
+  --user-agent USER_AGENT
+                        User-Agent personalizzato
+  --stdout              Stampa il JSON su stdout oltre a salvarlo su file
+"""
+
+# opzioni con valore: flag -> (attributo, conversione)
+_VALUE_OPTIONS = {
+    "-o": ("output", str),
+    "--output": ("output", str),
+    "--output-dir": ("output_dir", str),
+    "--timeout": ("timeout", int),
+    "--user-agent": ("user_agent", str),
+}
+# opzioni booleane: flag -> attributo
+_FLAG_OPTIONS = {
+    "--no-pretty": "no_pretty",
+    "--stdout": "stdout",
+}
+# opzioni lunghe nell'ordine dell'help, usate per risolvere i prefissi
+_LONG_OPTIONS = ("--help", "--output", "--output-dir", "--no-pretty", "--timeout", "--user-agent", "--stdout")
+
+
+def _resolve_long_option(flag: str, token: str) -> str:
+    """Come argparse, accetta un prefisso univoco di un'opzione lunga (es. --time per --timeout)."""
+    if flag in _LONG_OPTIONS:
+        return flag
+    matches = [option for option in _LONG_OPTIONS if option.startswith(flag)]
+    if len(matches) > 1:
+        _arg_error(f"ambiguous option: {token} could match {', '.join(matches)}")
+    return matches[0] if matches else flag
+
+
+def _option_label(flag: str) -> str:
+    return "-o/--output" if flag in ("-o", "--output") else flag
+
+
+def _looks_like_option(token: str) -> bool:
+    # come argparse: "-" da solo e i numeri negativi non sono opzioni
+    return token.startswith("-") and token != "-" and not token[1:].isdigit()
+
+
+def _arg_error(message: str) -> NoReturn:
+    sys.stderr.write(f"{_USAGE}scraper.py: error: {message}\n")
+    sys.exit(2)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> SimpleNamespace:
+    """Interpreta gli argomenti della riga di comando senza importare argparse."""
+    args = SimpleNamespace(
+        urls=[], output=None, output_dir="Results", no_pretty=False,
+        timeout=10, user_agent=None, stdout=False,
+    )
+    tokens = iter(sys.argv[1:] if argv is None else argv)
+    for token in tokens:
+        if token == "--":
+            args.urls.extend(tokens)
+            break
+
+        if token.startswith("--"):
+            flag, sep, value = token.partition("=")
+            flag = _resolve_long_option(flag, token)
+        elif token.startswith("-o") and len(token) > 2:
+            # "-oFILE" e, come in argparse, "-o=FILE"
+            flag, sep, value = "-o", "=", token[2:]
+            if value.startswith("="):
+                value = value[1:]
+        else:
+            flag, sep, value = token, "", ""
+
+        if flag in ("-h", "--help"):
+            sys.stdout.write(_HELP)
+            sys.exit(0)
+        if flag in _FLAG_OPTIONS:
+            if sep:
+                _arg_error(f"argument {flag}: ignored explicit argument '{value}'")
+            setattr(args, _FLAG_OPTIONS[flag], True)
+            continue
+        if flag in _VALUE_OPTIONS:
+            name, convert = _VALUE_OPTIONS[flag]
+            if not sep:
+                value = next(tokens, None)
+                if value is None or _looks_like_option(value):
+                    _arg_error(f"argument {_option_label(flag)}: expected one argument")
+            try:
+                setattr(args, name, convert(value))
+            except ValueError:
+                _arg_error(f"argument {_option_label(flag)}: invalid {convert.__name__} value: '{value}'")
+            continue
+        if _looks_like_option(token):
+            _arg_error(f"unrecognized arguments: {token}")
+        args.urls.append(token)
+
+    if not args.urls:
+        _arg_error("the following arguments are required: urls")
+    return args
 
 
 def main() -> int:
@@ -38,48 +161,105 @@ def main() -> int:
     base_output_dir = Path(args.output_dir)
     base_output_dir.mkdir(parents=True, exist_ok=True)
 
-    extractor = ContentExtractor(timeout=args.timeout, user_agent=args.user_agent)
     encountered_error = False
 
-    for idx, url in enumerate(args.urls, start=1):
+    pretty = not args.no_pretty
+    total = len(args.urls)
+    run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # cartella e timestamp sono fissi per tutta l'esecuzione: restano solo data, url e indice
+    build_path = functools.partial(
+        determine_output_path,
+        custom_output=args.output if total == 1 else None,
+        output_dir=base_output_dir,
+        ts=run_ts
+    )
+
+    writer_queue: "queue.Queue[Tuple[dict, str, bool] | None]" = queue.Queue()
+    write_errors: List[str] = []
+    writer = threading.Thread(
+        target=_writer_loop, args=(writer_queue, write_errors), name="json-writer", daemon=True
+    )
+    writer.start()
+
+    with ContentExtractor(timeout=args.timeout, user_agent=args.user_agent) as extractor, \
+            ThreadPoolExecutor(max_workers=min(MAX_WORKERS, total)) as executor:
+        futures = {}
+        for idx, url in enumerate(args.urls, start=1):
+            futures[executor.submit(_extract_with_progress, extractor, url, idx, total)] = (idx, url)
+
         try:
-            logger.info(f"==> Elaborazione URL {idx}/{len(args.urls)}: {url}")
-            data = extractor.extract(url)
-
-            if args.stdout:
-                print(f"\n=== {url} ===")
-                print(to_json(data, pretty=(not args.no_pretty)), flush=True)
-
-            output_path = determine_output_path(
-                custom_output=args.output if len(args.urls) == 1 else None,
-                output_dir=base_output_dir,
-                data=data,
-                url=url,
-                index=idx
-            )
-            saved = save_json(data, str(output_path), pretty=(not args.no_pretty))
-            logger.info(f"Risultato salvato in: {saved}")
+            for future in as_completed(futures):
+                idx, url = futures[future]
+                try:
+                    data = future.result()
 
-        except Exception as exc:
-            encountered_error = True
-            logger.exception(f"Errore durante lo scraping di {url}: {exc}")
+                    if args.stdout:
+                        stdout = sys.stdout.buffer
+                        stdout.write(f"\n=== {url} ===\n".encode("utf-8"))
+                        stdout.write(to_json_bytes(data, pretty=pretty))
+                        stdout.write(b"\n")
+
+                    output_path = build_path(data=data, url=url, index=idx)
+                    writer_queue.put((data, str(output_path), pretty))
+
+                except Exception as exc:
+                    encountered_error = True
+                    logger.exception(f"Errore durante lo scraping di {url}: {exc}")
+        except BaseException:
+            # Ctrl-C o errore imprevisto: gli URL non ancora avviati non vanno scaricati
+            executor.shutdown(wait=False, cancel_futures=True)
+            # sblocca i worker fermi nell'attesa tra una richiesta e l'altra
+            extractor.close()
+            # i risultati già accodati vengono comunque scritti prima di uscire
+            writer_queue.put(None)
+            writer.join()
+            raise
+
+    if args.stdout:
+        sys.stdout.buffer.flush()
+    writer_queue.put(None)
+    writer.join()
+    if write_errors:
+        encountered_error = True
 
     return 0 if not encountered_error else 1
 
 
+def _extract_with_progress(extractor: ContentExtractor, url: str, index: int, total: int) -> dict:
+    """Registra l'avanzamento quando un worker inizia davvero l'URL, non quando viene accodato."""
+    logger.info(f"==> Elaborazione URL {index}/{total}: {url}")
+    return extractor.extract(url)
+
+
+def _writer_loop(writer_queue: "queue.Queue[Tuple[dict, str, bool] | None]", errors: List[str]) -> None:
+    """Scrive su disco i risultati accodati finché non riceve None."""
+    while (item := writer_queue.get()) is not None:
+        data, output_path, pretty = item
+        try:
+            saved = save_json(data, output_path, pretty=pretty)
+            logger.info(f"Risultato salvato in: {saved}")
+        except Exception as exc:
+            errors.append(output_path)
+            logger.exception(f"Errore durante il salvataggio di {output_path}: {exc}")
+
+
 def determine_output_path(
     custom_output: str | None,
     output_dir: Path,
     data: dict,
     url: str,
-    index: int
+    index: int,
+    ts: str | None = None
 ) -> Path:
     if custom_output:
         return Path(custom_output)
 
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    domain = data.get("content", {}).get("domain") or urlparse(url).netloc or "output"
-    slug = sanitize_slug(urlparse(url).path) or "page"
+    # main() passa un timestamp unico per tutta l'esecuzione
+    if ts is None:
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    parsed = urlparse(url)
+    domain = data.get("content", {}).get("domain") or parsed.netloc or "output"
+    slug = sanitize_slug(parsed.path) or "page"
     filename = f"scrape_{sanitize_slug(domain)}_{slug}_{ts}_{index}.json"
     return output_dir / filename
 
@@ -88,9 +268,14 @@ def sanitize_slug(value: str) -> str:
     trimmed = value.strip("/")
     if not trimmed:
         return ""
-    normalized = re.sub(r"[^A-Za-z0-9._-]+", "_", trimmed)
+    # ogni sequenza di caratteri non ammessi diventa un solo "_"
+    normalized = "_".join(trimmed.translate(_SLUG_TABLE).split())
     return normalized.strip("_") or ""
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        exit_code = main()
+    finally:
+        stop_logging()
+    sys.exit(exit_code)
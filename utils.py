@@ -1,29 +1,83 @@
-import re
+import atexit
+import functools
 import logging
-from typing import Dict, Any
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+# listener che scrive i log su file e console da un thread dedicato
+log_listener: Optional[QueueListener] = None
 
 def setup_logging(level=logging.INFO):
     """Configura il sistema di logging"""
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('scraper.log'),
-            logging.StreamHandler()
-        ]
-    )
+    global log_listener
+    root = logging.getLogger()
+    if log_listener is None and not root.handlers:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [logging.FileHandler('scraper.log'), logging.StreamHandler()]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        log_queue = queue.Queue(-1)
+        root.setLevel(level)
+        root.addHandler(QueueHandler(log_queue))
+        log_listener = QueueListener(log_queue, *handlers)
+        log_listener.start()
+        atexit.register(stop_logging)
     return logging.getLogger('webscraper')
 
+def stop_logging() -> None:
+    """Svuota la coda dei log e ferma il listener"""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        for handler in log_listener.handlers:
+            handler.close()
+        log_listener = None
+
+_URL_SCHEMES = ("http://", "https://")
+# limite pratico dei browser; oltre questa lunghezza l'URL viene scartato senza analizzarlo
+MAX_URL_LENGTH = 2048
+# pattern semplici senza quantificatori annidati, applicati con fullmatch sulle singole parti
+_LABEL_RE = re.compile(r'[A-Za-z0-9-]+')
+_TLD_RE = re.compile(r'[A-Za-z]{2,}')
+_IPV4_RE = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+_PORT_RE = re.compile(r'\d+')
+_SPACE_RE = re.compile(r'\s')
+
+def _is_valid_host(host: str) -> bool:
+    """Accetta localhost, un IPv4 puntato o un dominio con TLD alfabetico"""
+    if host.lower() == "localhost" or _IPV4_RE.fullmatch(host):
+        return True
+    labels = host.split(".")
+    if len(labels) < 2 or not _TLD_RE.fullmatch(labels[-1]):
+        return False
+    return all(_LABEL_RE.fullmatch(label) for label in labels[:-1])
+
+@functools.lru_cache(maxsize=4096)
 def is_valid_url(url: str) -> bool:
     """Verifica se l'URL fornito è valido"""
-    pattern = re.compile(
-        r'^(https?:\/\/)?'  # http:// o https://
-        r'((([A-Za-z0-9-]+\.)+[A-Za-z]{2,})|'  # dominio
-        r'localhost|'  # localhost
-        r'(\d{1,3}\.){3}\d{1,3})'  # o indirizzo IP
-        r'(\:\d+)?'  # porta opzionale
-        r'(\/[^\s]*)?$', re.IGNORECASE)
-    return re.match(pattern, url) is not None
+    if not url or len(url) > MAX_URL_LENGTH:
+        return False
+    if _SPACE_RE.search(url):
+        return False
+    candidate = url if url[:8].lower().startswith(_URL_SCHEMES) else "http://" + url
+    try:
+        parsed = urlparse(candidate)
+    except ValueError:
+        return False
+    netloc = parsed.netloc
+    if not netloc or parsed.scheme.lower() not in ("http", "https"):
+        return False
+    # dopo l'host è ammesso solo un percorso che inizia con "/"
+    rest = candidate[len(parsed.scheme) + 3 + len(netloc):]
+    if rest and rest[0] != "/":
+        return False
+    host, sep, port = netloc.partition(":")
+    if sep and not _PORT_RE.fullmatch(port):
+        return False
+    return _is_valid_host(host)
 
 def clean_text(text: str) -> str:
     """Pulisce il testo rimuovendo spazi extra e caratteri non necessari"""
@@ -31,11 +85,12 @@ def clean_text(text: str) -> str:
         return ""
     return ' '.join(text.split())
 
+_SIZE_UNITS = ("bytes", "KB", "MB", "GB")
+
 def format_size(size_bytes: int) -> str:
     """Converte una dimensione in byte in un formato leggibile"""
     if size_bytes < 1024:
         return f"{size_bytes} bytes"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes/1024:.1f} KB"
-    else:
-        return f"{size_bytes/(1024*1024):.1f} MB"
\ No newline at end of file
+    # ogni unità vale 2**10 della precedente: bit_length sceglie l'unità senza confronti a catena
+    unit = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit * 10)):.1f} {_SIZE_UNITS[unit]}"